@@ -1,10 +1,37 @@
-import os, sys
+import os, sys, copy
 from PyQt5 import QtWidgets as QtW
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QThread, pyqtSignal
 
 import graph
 import configPanel
 import yamlLoader
+import configDiff
+import diffView
+import paramSweep
+
+
+class SweepThread(QThread):
+    """Runs a parameter sweep off the GUI thread."""
+
+    succeeded = pyqtSignal(str)
+    failed = pyqtSignal(str)
+
+    def __init__(self, document, stem, spec_path, output_dir, parent=None):
+        super().__init__(parent)
+        self.document = document
+        self.stem = stem
+        self.spec_path = spec_path
+        self.output_dir = output_dir
+
+    def run(self):
+        try:
+            manifest = paramSweep.sweep_document(
+                self.document, self.stem, self.spec_path, self.output_dir
+            )
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.succeeded.emit(manifest)
 
 
 class MainWindow(QtW.QMainWindow):
@@ -13,6 +40,10 @@ class MainWindow(QtW.QMainWindow):
         self.setWindowTitle("pandemic-config-gui")
         self.resize(1280, 720)
 
+        self.current_path = None
+        self.source = None
+        self.sweep_thread = None
+
         self.splitter = QtW.QSplitter(Qt.Horizontal)
 
         left_panel = configPanel.DiseaseConfigWidget()
@@ -34,9 +65,48 @@ class MainWindow(QtW.QMainWindow):
         load_action.triggered.connect(self.on_import_yaml)
         file_menu.addAction(load_action)
 
+        compare_action = QtW.QAction("Compare With...", self)
+        compare_action.triggered.connect(self.on_compare_yaml)
+        file_menu.addAction(compare_action)
+
+        self.sweep_action = QtW.QAction("Parameter Sweep...", self)
+        self.sweep_action.triggered.connect(self.on_parameter_sweep)
+        file_menu.addAction(self.sweep_action)
+
     def handle_config_save(self, config_data):
-        print("MainWindow received saved config.")
-        graph_data = self.right_panel.graph.serialize_session()
+        if self.source is None:
+            QtW.QMessageBox.information(
+                self, "Save Configuration", "Import a YAML config to save into first."
+            )
+            return
+
+        invalid = (
+            self.splitter.widget(0).invalid_fields() + self.right_panel.invalid_fields()
+        )
+        if invalid:
+            QtW.QMessageBox.warning(
+                self,
+                "Save Configuration",
+                "These values are out of range or not numbers, so nothing was "
+                "saved:\n" + "\n".join(invalid),
+            )
+            return
+
+        changed = yamlLoader.save_config(
+            self.current_path, self.source, config_data, self.right_panel
+        )
+        if changed is None:
+            QtW.QMessageBox.warning(
+                self,
+                "Save Configuration",
+                f"Could not save to {self.current_path}; see the log for details.",
+            )
+        elif not changed:
+            self.statusBar().showMessage("No changes to save.", 5000)
+        else:
+            self.statusBar().showMessage(
+                f"Saved {changed} change(s) to {self.current_path}.", 5000
+            )
 
     def on_import_yaml(self):
         file_path, _ = QtW.QFileDialog.getOpenFileName(
@@ -46,7 +116,113 @@ class MainWindow(QtW.QMainWindow):
             config_panel = self.splitter.widget(0)
             graph_widget = self.right_panel
 
-            yamlLoader.load_config(file_path, config_panel, graph_widget)
+            self.source = yamlLoader.load_config(file_path, config_panel, graph_widget)
+            self.current_path = file_path
+
+    def on_compare_yaml(self):
+        if not self.current_path:
+            QtW.QMessageBox.information(
+                self,
+                "Compare Configs",
+                "Import a YAML config to compare against first.",
+            )
+            return
+
+        file_path, _ = QtW.QFileDialog.getOpenFileName(
+            self, "Compare With Config File", "", "YAML Files (*.yaml *.yml)"
+        )
+        if not file_path:
+            return
+
+        try:
+            other = configDiff.load_disease(file_path)
+            differences = configDiff.diff_diseases(
+                other, configDiff.load_disease(self.current_path)
+            )
+        except Exception as e:
+            QtW.QMessageBox.warning(self, "Compare Configs", f"Diff failed: {e}")
+            return
+
+        # The graph shows the current config, so diff towards it and colour
+        # whatever it has that the other file does not.
+        colors = {
+            name: configDiff.DIFF_COLORS[kind]
+            for name, kind in configDiff.affected_nodes(differences, other).items()
+        }
+        self.right_panel.highlight_nodes(colors)
+
+        dialog = diffView.DiffDialog(file_path, self.current_path, differences, self)
+        dialog.show()
+
+    def on_parameter_sweep(self):
+        if self.source is None:
+            QtW.QMessageBox.information(
+                self, "Parameter Sweep", "Import a YAML config to sweep first."
+            )
+            return
+
+        # The sweep starts from the config as loaded, so edits made since
+        # must be saved first or they would be left out without notice.
+        config_panel = self.splitter.widget(0)
+        unsaved = yamlLoader.unsaved_changes(
+            self.source, config_panel.config_data(), self.right_panel
+        )
+        if unsaved:
+            answer = QtW.QMessageBox.question(
+                self,
+                "Parameter Sweep",
+                f"The config has {unsaved} unsaved change(s), which the sweep "
+                "would not include. Save them first?",
+                QtW.QMessageBox.Save | QtW.QMessageBox.Cancel,
+            )
+            if answer != QtW.QMessageBox.Save:
+                return
+            self.handle_config_save(config_panel.config_data())
+            if yamlLoader.unsaved_changes(
+                self.source, config_panel.config_data(), self.right_panel
+            ):
+                return
+
+        spec_path, _ = QtW.QFileDialog.getOpenFileName(
+            self, "Open Sweep Spec", "", "YAML Files (*.yaml *.yml)"
+        )
+        if not spec_path:
+            return
+
+        output_dir = QtW.QFileDialog.getExistingDirectory(self, "Sweep Output Folder")
+        if not output_dir:
+            return
+
+        stem = os.path.splitext(os.path.basename(self.current_path))[0]
+        self.sweep_thread = SweepThread(
+            copy.deepcopy(self.source.data), stem, spec_path, output_dir, self
+        )
+        self.sweep_thread.succeeded.connect(self.on_sweep_succeeded)
+        self.sweep_thread.failed.connect(self.on_sweep_failed)
+        self.sweep_thread.finished.connect(self.on_sweep_finished)
+
+        self.sweep_action.setEnabled(False)
+        self.statusBar().showMessage("Running parameter sweep...")
+        self.sweep_thread.start()
+
+    def on_sweep_succeeded(self, manifest):
+        QtW.QMessageBox.information(
+            self, "Parameter Sweep", f"Wrote sweep manifest to {manifest}"
+        )
+
+    def on_sweep_failed(self, message):
+        QtW.QMessageBox.warning(self, "Parameter Sweep", f"Sweep failed: {message}")
+
+    def closeEvent(self, event):
+        # Qt aborts if a running QThread is destroyed, so let a sweep finish.
+        if self.sweep_thread is not None:
+            self.sweep_thread.wait()
+        super().closeEvent(event)
+
+    def on_sweep_finished(self):
+        self.sweep_thread = None
+        self.sweep_action.setEnabled(True)
+        self.statusBar().clearMessage()
 
 
 def run_app():
@@ -0,0 +1,277 @@
+import sys
+import hashlib
+import argparse
+from collections import defaultdict
+
+import yaml
+
+ADDED = "added"
+REMOVED = "removed"
+CHANGED = "changed"
+
+DIFF_COLORS = {
+    ADDED: (60, 200, 90),
+    REMOVED: (220, 70, 70),
+    CHANGED: (230, 60, 200),
+}
+
+
+class Difference:
+    """A single difference between two disease configs."""
+
+    __slots__ = ("path", "kind", "old", "new")
+
+    def __init__(self, path, kind, old=None, new=None):
+        self.path = path
+        self.kind = kind
+        self.old = old
+        self.new = new
+
+    def __repr__(self):
+        return f"Difference({format_path(self.path)!r}, {self.kind!r})"
+
+    def __str__(self):
+        path = format_path(self.path)
+        if self.kind == ADDED:
+            return f"+ {path}: {_short(self.new)}"
+        if self.kind == REMOVED:
+            return f"- {path}: {_short(self.old)}"
+        return f"~ {path}: {_short(self.old)} -> {_short(self.new)}"
+
+
+class _Subtree:
+    """A node of a config document annotated with the hash of its contents."""
+
+    __slots__ = ("digest", "value", "children")
+
+    def __init__(self, digest, value, children=None):
+        self.digest = digest
+        self.value = value
+        self.children = children
+
+
+def load_disease(file_path):
+    """Reads the 'disease' section of a YAML config file."""
+    with open(file_path, "r", encoding="utf-8") as f:
+        data = yaml.safe_load(f) or {}
+
+    disease = data.get("disease", {})
+    if not disease:
+        raise ValueError(f"{file_path} does not contain a 'disease' section.")
+    return disease
+
+
+def stage_node_names(stages):
+    """
+    Names the graph nodes a trajectory's stages map to, matching the
+    "<tag> <n>" naming the graph builder uses for repeated symptom tags.
+    """
+    counts = defaultdict(int)
+    names = []
+    for stage in stages:
+        tag = stage.get("symptom_tag")
+        counts[tag] += 1
+        names.append(tag if counts[tag] == 1 else f"{tag} {counts[tag]}")
+    return names
+
+
+def stage_edge_names(stages):
+    """
+    Names the edge each stage's completion_time belongs to: "<from> -> <to>"
+    for every stage but the last, which is named after its own node.
+    """
+    names = stage_node_names(stages)
+    edges = [f"{names[i]} -> {names[i + 1]}" for i in range(len(names) - 1)]
+    return edges + names[-1:]
+
+
+def canonicalize(disease):
+    """
+    Rearranges a disease section so that list entries are keyed by identity
+    rather than position: symptom tags by name, trajectories by their stage
+    sequence and completion times by the graph edge they belong to. A stage
+    sequence that appears more than once is numbered by occurrence, e.g.
+    "exposed => mild (2)" for the second, so other trajectories moving
+    around do not renumber it.
+    """
+    canonical = dict(disease)
+
+    canonical["symptom_tags"] = {
+        t.get("name"): t.get("value") for t in disease.get("symptom_tags", [])
+    }
+
+    trajectories = {}
+    occurrences = defaultdict(int)
+    for traj in disease.get("trajectories", []):
+        stages = traj.get("stages", [])
+        edges = {
+            edge: stage.get("completion_time", {})
+            for edge, stage in zip(stage_edge_names(stages), stages)
+        }
+
+        key = " => ".join(str(stage.get("symptom_tag")) for stage in stages)
+        occurrences[key] += 1
+        if occurrences[key] > 1:
+            key = f"{key} ({occurrences[key]})"
+        trajectories[key] = {"description": traj.get("description"), "edges": edges}
+
+    canonical["trajectories"] = trajectories
+    return canonical
+
+
+def build_tree(obj):
+    """Hashes every subtree of a document bottom-up (a Merkle tree)."""
+    if isinstance(obj, dict):
+        children = {str(k): build_tree(v) for k, v in obj.items()}
+        h = hashlib.blake2b(b"d", digest_size=16)
+        for key in sorted(children):
+            h.update(key.encode("utf-8"))
+            h.update(children[key].digest)
+        return _Subtree(h.digest(), obj, children)
+
+    if isinstance(obj, (list, tuple)):
+        children = [build_tree(v) for v in obj]
+        h = hashlib.blake2b(b"l", digest_size=16)
+        for child in children:
+            h.update(child.digest)
+        return _Subtree(h.digest(), obj, children)
+
+    return _Subtree(_leaf_digest(obj), obj)
+
+
+def _leaf_digest(value):
+    # Numbers hash by their float value so that 1 and 1.0 compare equal.
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        token = f"n{float(value)!r}"
+    else:
+        token = f"s{type(value).__name__}:{value}"
+    return hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+
+
+def diff_trees(tree_a, tree_b, path=()):
+    """Yields the differences between two hashed trees."""
+    if tree_a.digest == tree_b.digest:
+        return
+
+    if isinstance(tree_a.children, dict) and isinstance(tree_b.children, dict):
+        for key, child_a in tree_a.children.items():
+            child_b = tree_b.children.get(key)
+            if child_b is None:
+                yield Difference(path + (key,), REMOVED, old=child_a.value)
+            else:
+                yield from diff_trees(child_a, child_b, path + (key,))
+        for key, child_b in tree_b.children.items():
+            if key not in tree_a.children:
+                yield Difference(path + (key,), ADDED, new=child_b.value)
+        return
+
+    if isinstance(tree_a.children, list) and isinstance(tree_b.children, list):
+        common = min(len(tree_a.children), len(tree_b.children))
+        for i in range(common):
+            yield from diff_trees(tree_a.children[i], tree_b.children[i], path + (i,))
+        for i in range(common, len(tree_a.children)):
+            yield Difference(path + (i,), REMOVED, old=tree_a.children[i].value)
+        for i in range(common, len(tree_b.children)):
+            yield Difference(path + (i,), ADDED, new=tree_b.children[i].value)
+        return
+
+    yield Difference(path, CHANGED, old=tree_a.value, new=tree_b.value)
+
+
+def diff_diseases(disease_a, disease_b):
+    """Returns the structural differences going from disease_a to disease_b."""
+    tree_a = build_tree(canonicalize(disease_a))
+    tree_b = build_tree(canonicalize(disease_b))
+    return list(diff_trees(tree_a, tree_b))
+
+
+def diff_files(path_a, path_b):
+    return diff_diseases(load_disease(path_a), load_disease(path_b))
+
+
+def graph_names(disease):
+    """Returns the names of every node and edge a disease's graph draws."""
+    names = set()
+    for traj in disease.get("trajectories", []):
+        stages = traj.get("stages", [])
+        names.update(stage_node_names(stages))
+        names.update(stage_edge_names(stages))
+    return names
+
+
+def affected_nodes(differences, disease_a):
+    """
+    Maps the differences going from disease_a onto the names of the graph
+    nodes they touch. A trajectory that is new only marks the edges that no
+    trajectory of disease_a has. Returns a dict of node name -> difference
+    kind.
+    """
+    nodes = {}
+    existing = graph_names(disease_a)
+
+    def mark(name, kind):
+        # A node both added to and changed in a config shows as changed.
+        if nodes.get(name) != CHANGED:
+            nodes[name] = kind
+
+    for diff in differences:
+        path = diff.path
+        if not path:
+            continue
+
+        if path[0] == "symptom_tags" and len(path) > 1:
+            mark(path[1], diff.kind)
+
+        elif path[0] == "trajectories" and len(path) > 1:
+            if len(path) == 2:
+                # A whole trajectory appeared or disappeared.
+                value = diff.new if diff.kind == ADDED else diff.old
+                for edge in (value or {}).get("edges", {}):
+                    if diff.kind != ADDED or edge not in existing:
+                        mark(edge, diff.kind)
+            elif len(path) > 3 and path[2] == "edges":
+                mark(path[3], CHANGED if len(path) > 4 else diff.kind)
+
+    return {name: kind for name, kind in nodes.items() if kind != REMOVED}
+
+
+def format_path(path):
+    parts = []
+    for part in path:
+        if isinstance(part, int):
+            parts.append(f"[{part}]")
+        elif parts:
+            parts.append(f"[{part}]" if " " in part else f".{part}")
+        else:
+            parts.append(part)
+    return "".join(parts)
+
+
+def _short(value, limit=60):
+    text = repr(value)
+    return text if len(text) <= limit else text[: limit - 3] + "..."
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="configDiff",
+        description="Structurally compare the disease sections of two configs.",
+    )
+    parser.add_argument("config_a")
+    parser.add_argument("config_b")
+    args = parser.parse_args(argv)
+
+    try:
+        differences = diff_files(args.config_a, args.config_b)
+    except (OSError, ValueError, yaml.YAMLError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    for diff in differences:
+        print(diff)
+
+    return 1 if differences else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
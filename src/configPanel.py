@@ -1,5 +1,8 @@
 from PyQt5 import QtWidgets as QtW
-from PyQt5.QtCore import Qt, pyqtSignal, QPropertyAnimation, QAbstractAnimation
+from PyQt5.QtCore import Qt, pyqtSignal, QPropertyAnimation, QAbstractAnimation, QTimer
+
+import distributions
+import infectiousnessPlot
 
 DISEASE_STAGES = [
     "recovered",
@@ -15,16 +18,20 @@ DISEASE_STAGES = [
     "dead_icu",
 ]
 
-DISTRIBUTION_TYPES = ["constant", "normal", "lognormal", "beta", "gamma", "exponweib"]
+DISTRIBUTION_TYPES = list(distributions.DISTRIBUTIONS)
+
+PROFILE_DEBOUNCE_MS = 250
 
 
 class DistributionEditor(QtW.QWidget):
     """
     A widget that lets you pick a distribution type and edits its parameters.
-    Emits sig_resize when the number of fields changes.
+    Emits sig_resize when the number of fields changes and sig_changed when
+    the type or any parameter is edited.
     """
 
     sig_resize = pyqtSignal()
+    sig_changed = pyqtSignal()
 
     def __init__(self, label_text, default_type="constant"):
         super().__init__()
@@ -58,28 +65,25 @@ class DistributionEditor(QtW.QWidget):
             if child.widget():
                 child.widget().deleteLater()
         self.inputs = {}
+        self.dist = distributions.DISTRIBUTIONS.get(dist_type)
 
-        fields = []
-        if dist_type == "constant":
-            fields = ["value"]
-        elif dist_type == "normal":
-            fields = ["loc", "scale"]
-        elif dist_type == "lognormal":
-            fields = ["s", "loc", "scale"]
-        elif dist_type == "gamma":
-            fields = ["a", "loc", "scale"]
-        elif dist_type == "beta":
-            fields = ["a", "b", "loc", "scale"]
-        elif dist_type == "exponweib":
-            fields = ["a", "c", "loc", "scale"]
-
-        for field in fields:
+        for param in self.dist.params if self.dist else []:
             line_edit = QtW.QLineEdit()
-            line_edit.setPlaceholderText("0.0")
-            self.inputs[field] = line_edit
-            self.params_layout.addRow(f"{field}:", line_edit)
+            line_edit.setPlaceholderText(param.default_text())
+            line_edit.setValidator(distributions.ParamValidator(param, line_edit))
+            line_edit.textChanged.connect(
+                lambda _, w=line_edit, p=param: distributions.mark_field(w, p)
+            )
+            line_edit.textChanged.connect(self.sig_changed)
+            self.inputs[param.name] = line_edit
+            self.params_layout.addRow(f"{param.name}:", line_edit)
 
         self.sig_resize.emit()
+        self.sig_changed.emit()
+
+    def invalid_fields(self):
+        """Names the fields flagged as out of bounds or not a number."""
+        return [name for name, w in self.inputs.items() if w.property("invalid")]
 
     def get_data(self):
         dist_type = self.type_combo.currentText()
@@ -87,12 +91,9 @@ class DistributionEditor(QtW.QWidget):
         for field, widget in self.inputs.items():
             val = widget.text()
             try:
-                if "." in val:
-                    data[field] = float(val)
-                else:
-                    data[field] = int(val)
+                data[field] = self.dist.param(field).parse(val)
             except ValueError:
-                data[field] = val if val else 0.0
+                data[field] = val
         return data
 
 
@@ -266,6 +267,22 @@ class DiseaseConfigWidget(QtW.QWidget):
 
         self.form_layout.addWidget(self.accordion)
 
+        self.form_layout.addWidget(QtW.QLabel("Infectiousness Profile:"))
+        self.profile_plot = infectiousnessPlot.InfectiousnessPlot()
+        self.form_layout.addWidget(self.profile_plot)
+
+        # Sampling the profile is cheap but not free, so wait for a pause in
+        # typing rather than redrawing on every keystroke.
+        self.profile_timer = QTimer(self)
+        self.profile_timer.setSingleShot(True)
+        self.profile_timer.setInterval(PROFILE_DEBOUNCE_MS)
+        self.profile_timer.timeout.connect(self.update_profile)
+
+        self.trans_type_combo.currentTextChanged.connect(self.profile_timer.start)
+        for editor in self.trans_editors.values():
+            editor.sig_changed.connect(self.profile_timer.start)
+        self.profile_timer.start()
+
         self.form_layout.addSpacing(20)
         self.save_button = QtW.QPushButton("Save Configuration")
         self.save_button.clicked.connect(self.getConfigData)
@@ -276,7 +293,27 @@ class DiseaseConfigWidget(QtW.QWidget):
         self.scroll_area.setWidget(self.content_widget)
         main_layout.addWidget(self.scroll_area)
 
-    def getConfigData(self):
+    def update_profile(self):
+        dists = {key: editor.get_data() for key, editor in self.trans_editors.items()}
+        try:
+            times, envelope = infectiousnessPlot.profile_envelope(
+                self.trans_type_combo.currentText(), dists
+            )
+        except ValueError as e:
+            self.profile_plot.set_message(f"Cannot draw profile: {e}")
+            return
+
+        self.profile_plot.set_profile(times, envelope)
+
+    def invalid_fields(self):
+        return [
+            f"{key}: {name}"
+            for key, editor in self.trans_editors.items()
+            for name in editor.invalid_fields()
+        ]
+
+    def config_data(self):
+        """Returns the panel's current values, without saving them."""
         config_data = {
             "name": self.name_entry.text(),
             "default_lowest_stage": self.dls_combo.currentText(),
@@ -286,6 +323,10 @@ class DiseaseConfigWidget(QtW.QWidget):
 
         for key, editor in self.trans_editors.items():
             config_data["transmission"][key] = editor.get_data()
+        return config_data
+
+    def getConfigData(self):
+        config_data = self.config_data()
 
         print("--- Configuration Data Retrieved ---")
         print(f"Name: {config_data['name']}")
@@ -0,0 +1,53 @@
+from PyQt5 import QtWidgets as QtW
+from PyQt5.QtGui import QColor
+
+import configDiff
+
+KIND_COLORS = {kind: QColor(*rgb) for kind, rgb in configDiff.DIFF_COLORS.items()}
+
+
+class DiffDialog(QtW.QDialog):
+    """
+    Lists the differences between two disease configs, grouped by the
+    top-level section they appear in.
+    """
+
+    def __init__(self, base_path, other_path, differences, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Config Diff")
+        self.resize(700, 500)
+
+        layout = QtW.QVBoxLayout(self)
+        layout.addWidget(QtW.QLabel(f"<b>Base:</b> {base_path}"))
+        layout.addWidget(QtW.QLabel(f"<b>Compared with:</b> {other_path}"))
+
+        self.tree = QtW.QTreeWidget()
+        self.tree.setHeaderLabels(["Path", "Base", "Compared"])
+        self.tree.setAlternatingRowColors(True)
+        layout.addWidget(self.tree)
+
+        if not differences:
+            layout.addWidget(QtW.QLabel("The configs are identical."))
+
+        sections = {}
+        for diff in differences:
+            section = str(diff.path[0]) if diff.path else ""
+            if section not in sections:
+                sections[section] = QtW.QTreeWidgetItem(self.tree, [section])
+                sections[section].setExpanded(True)
+
+            item = QtW.QTreeWidgetItem(
+                sections[section],
+                [
+                    configDiff.format_path(diff.path[1:]) or section,
+                    "" if diff.kind == configDiff.ADDED else repr(diff.old),
+                    "" if diff.kind == configDiff.REMOVED else repr(diff.new),
+                ],
+            )
+            item.setForeground(0, KIND_COLORS[diff.kind])
+
+        self.tree.resizeColumnToContents(0)
+
+        close_button = QtW.QPushButton("Close")
+        close_button.clicked.connect(self.close)
+        layout.addWidget(close_button)
@@ -0,0 +1,158 @@
+import re
+
+from PyQt5.QtGui import QValidator
+
+_NUMBER = re.compile(r"[+-]?(\d+(\.\d*)?|\.\d+)([eE][+-]?\d+)?$")
+_INTEGER = re.compile(r"[+-]?\d+$")
+# Anything that could still become a number with more typing, e.g. "-" or "1e".
+_PARTIAL = re.compile(r"[+-]?(\d+\.?\d*|\.\d*)?([eE][+-]?\d*)?$")
+
+
+class Param:
+    """
+    One parameter of a distribution: its name, default, bounds and any other
+    names it may appear under in a config. Bounds are inclusive unless
+    inclusive is False.
+    """
+
+    def __init__(
+        self, name, default=0.0, minimum=None, maximum=None, inclusive=True, aliases=()
+    ):
+        self.name = name
+        self.default = default
+        self.minimum = minimum
+        self.maximum = maximum
+        self.inclusive = inclusive
+        self.aliases = tuple(aliases)
+        self.validate = compile_validator(minimum, maximum, inclusive)
+
+    def default_text(self):
+        return str(self.default)
+
+    def parse(self, text):
+        """
+        Converts field text into a number, keeping integers as ints. Empty
+        text gives the default; anything else that isn't a number raises
+        ValueError.
+        """
+        text = str(text).strip()
+        if not text:
+            return self.default
+        if _INTEGER.match(text):
+            return int(text)
+        if _NUMBER.match(text):
+            return float(text)
+        raise ValueError(f"'{text}' is not a number.")
+
+
+class Distribution:
+    """A distribution type and the parameters it is written with."""
+
+    def __init__(self, name, params):
+        self.name = name
+        self.params = params
+        self.node_name = f"{name.capitalize()}Time"
+        self.label = f"{name.capitalize()} Time"
+        self._params = {param.name: param for param in params}
+        self._names = {}
+        for param in params:
+            self._names[param.name] = param.name
+            for alias in param.aliases:
+                self._names[alias] = param.name
+
+    def param(self, key):
+        """Returns the parameter a config key refers to, or None."""
+        return self._params.get(self.resolve(key))
+
+    def resolve(self, key):
+        """Maps a config key, or one of its aliases, to the parameter name."""
+        return self._names.get(key, key)
+
+    def defaults(self):
+        return {param.name: param.default for param in self.params}
+
+
+def compile_validator(minimum=None, maximum=None, inclusive=True):
+    """
+    Builds the check run on every keystroke of a field. The bounds are
+    bound into a single closure up front, so a call is one regex match and
+    at most two comparisons. Returns a function of the field text giving a
+    QValidator state: numbers outside the bounds are Intermediate, like text
+    that is not yet a number.
+    """
+    low = float("-inf") if minimum is None else minimum
+    high = float("inf") if maximum is None else maximum
+
+    if minimum is None and maximum is None:
+        in_bounds = None
+    elif inclusive:
+        in_bounds = lambda value: low <= value <= high
+    else:
+        in_bounds = lambda value: low < value < high
+
+    number = _NUMBER.match
+    partial = _PARTIAL.match
+
+    def validate(text):
+        if not text or number(text):
+            if in_bounds is None or not text or in_bounds(float(text)):
+                return QValidator.Acceptable
+            return QValidator.Intermediate
+        return QValidator.Intermediate if partial(text) else QValidator.Invalid
+
+    return validate
+
+
+class ParamValidator(QValidator):
+    """
+    Applies a parameter's compiled check to a QLineEdit. Numbers outside the
+    bounds are still Acceptable here, so the field commits them (node inputs
+    only store their text once editing finishes); mark_field flags them.
+    """
+
+    def __init__(self, param, parent=None):
+        super().__init__(parent)
+        self._validate = param.validate
+
+    def validate(self, text, pos):
+        stripped = text.strip()
+        state = self._validate(stripped)
+        if state == QValidator.Intermediate and _NUMBER.match(stripped):
+            state = QValidator.Acceptable
+        return state, text, pos
+
+
+def mark_field(line_edit, param):
+    """
+    Sets the "invalid" property of a parameter field whose text is out of
+    bounds or not yet a number, restyling it when that changes.
+    """
+    invalid = param.validate(line_edit.text().strip()) != QValidator.Acceptable
+    if line_edit.property("invalid") != invalid:
+        line_edit.setProperty("invalid", invalid)
+        line_edit.style().unpolish(line_edit)
+        line_edit.style().polish(line_edit)
+
+
+def _positive(name, default=1.0):
+    return Param(name, default, minimum=0.0, inclusive=False)
+
+
+# Every distribution a config can use. The config panel's parameter fields
+# and the graph's time nodes are both generated from this table.
+DISTRIBUTIONS = {
+    dist.name: dist
+    for dist in [
+        Distribution("constant", [Param("value", aliases=["loc"])]),
+        Distribution("normal", [Param("loc"), _positive("scale")]),
+        Distribution("lognormal", [_positive("s"), Param("loc"), _positive("scale")]),
+        Distribution(
+            "beta", [_positive("a"), _positive("b"), Param("loc"), _positive("scale")]
+        ),
+        Distribution("gamma", [_positive("a"), Param("loc"), _positive("scale")]),
+        Distribution(
+            "exponweib",
+            [_positive("a"), _positive("c"), Param("loc"), _positive("scale")],
+        ),
+    ]
+}
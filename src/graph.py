@@ -1,6 +1,12 @@
 from PyQt5 import QtWidgets as QtW
 import NodeGraphQt as NGQt
 
+import distributions
+
+# Node inputs carry their own stylesheet, which the theme's rule for flagged
+# fields can't override.
+INVALID_FIELD_STYLE = 'QLineEdit[invalid="true"] { border: 1px solid #E57373; }'
+
 
 class DefaultLowestStage(NGQt.BaseNode):
     __identifier__ = "symptoms"
@@ -39,78 +45,43 @@ class TerminalStage(NGQt.BaseNode):
         self.add_text_input("tag", "Value", "0")
 
 
-class ConstantTime(NGQt.BaseNode):
-    __identifier__ = "transitions"
-    NODE_NAME = "ConstantTime"
-
-    def __init__(self):
-        super(ConstantTime, self).__init__()
-        self.set_name("Constant Time")
-        self.set_color(220, 160, 20)
-        self.add_input("Symptom")
-        self.add_output("Next")
-        self.add_text_input("Val", "Value", text="0.0")
-
+class TimeNode(NGQt.BaseNode):
+    """
+    Base for the transition time nodes. Subclasses are generated from the
+    distribution registry and get one validated text input per parameter.
+    """
 
-class NormalTime(NGQt.BaseNode):
     __identifier__ = "transitions"
-    NODE_NAME = "NormalTime"
+    DISTRIBUTION = None
 
     def __init__(self):
-        super(NormalTime, self).__init__()
-        self.set_name("Normal Time")
+        super(TimeNode, self).__init__()
+        dist = distributions.DISTRIBUTIONS[self.DISTRIBUTION]
+        self.set_name(dist.label)
         self.set_color(220, 160, 20)
         self.add_input("Symptom")
         self.add_output("Next")
-        self.add_text_input("loc", "loc", text="0.0")
-        self.add_text_input("scale", "scale", text="0.0")
 
+        for param in dist.params:
+            self.add_text_input(param.name, param.name, text=param.default_text())
+            line_edit = self.get_widget(param.name).get_custom_widget()
+            line_edit.setValidator(distributions.ParamValidator(param, line_edit))
+            line_edit.setStyleSheet(line_edit.styleSheet() + INVALID_FIELD_STYLE)
+            line_edit.textChanged.connect(
+                lambda _, w=line_edit, p=param: distributions.mark_field(w, p)
+            )
+            distributions.mark_field(line_edit, param)
 
-class BetaTime(NGQt.BaseNode):
-    __identifier__ = "transitions"
-    NODE_NAME = "BetaTime"
 
-    def __init__(self):
-        super(BetaTime, self).__init__()
-        self.set_name("Beta Time")
-        self.set_color(220, 160, 20)
-        self.add_input("Symptom")
-        self.add_output("Next")
-        self.add_text_input("a", "a", text="0.0")
-        self.add_text_input("b", "b", text="0.0")
-        self.add_text_input("loc", "loc", text="0.0")
-        self.add_text_input("scale", "scale", text="0.0")
+def _make_time_node(dist):
+    return type(
+        dist.node_name,
+        (TimeNode,),
+        {"NODE_NAME": dist.node_name, "DISTRIBUTION": dist.name},
+    )
 
 
-class LognormalTime(NGQt.BaseNode):
-    __identifier__ = "transitions"
-    NODE_NAME = "LognormalTime"
-
-    def __init__(self):
-        super(LognormalTime, self).__init__()
-        self.set_name("Lognormal Time")
-        self.set_color(220, 160, 20)
-        self.add_input("Symptom")
-        self.add_output("Next")
-        self.add_text_input("s", "s", text="0.0")
-        self.add_text_input("loc", "loc", text="0.0")
-        self.add_text_input("scale", "scale", text="0.0")
-
-
-class ExponweibTime(NGQt.BaseNode):
-    __identifier__ = "transitions"
-    NODE_NAME = "ExponweibTime"
-
-    def __init__(self):
-        super(ExponweibTime, self).__init__()
-        self.set_name("Exponweib Time")
-        self.set_color(220, 160, 20)
-        self.add_input("Symptom")
-        self.add_output("Next")
-        self.add_text_input("a", "a", text="0.0")
-        self.add_text_input("c", "c", text="0.0")
-        self.add_text_input("loc", "loc", text="0.0")
-        self.add_text_input("scale", "scale", text="0.0")
+TIME_NODES = [_make_time_node(dist) for dist in distributions.DISTRIBUTIONS.values()]
 
 
 class NodeGraphWidget(QtW.QWidget):
@@ -123,19 +94,23 @@ class NodeGraphWidget(QtW.QWidget):
         self.graph = NGQt.NodeGraph()
         layout.addWidget(self.graph.viewer())
 
+        # node id -> paths in the loaded file that the node was built from.
+        self.source_paths = {}
+
+        # node id -> colour a node had before it was highlighted.
+        self._base_colors = {}
+
         self.graph.register_nodes(
             [
                 DefaultLowestStage,
                 TransitionNode,
                 TerminalStage,
-                ConstantTime,
-                NormalTime,
-                BetaTime,
-                LognormalTime,
-                ExponweibTime,
             ]
+            + TIME_NODES
         )
 
+        self.graph.property_changed.connect(self._sync_tag)
+
         self.graph.set_background_color(38, 50, 56)
         self.graph.set_grid_color(55, 71, 79)
 
@@ -156,8 +131,55 @@ class NodeGraphWidget(QtW.QWidget):
 
         trans_menu = graph_menu.add_menu("Transition Nodes")
 
-        trans_menu.add_command("Constant Time", create_cmd(ConstantTime))
-        trans_menu.add_command("Normal Time", create_cmd(NormalTime))
-        trans_menu.add_command("Beta Time", create_cmd(BetaTime))
-        trans_menu.add_command("Lognormal Time", create_cmd(LognormalTime))
-        trans_menu.add_command("Exponweib Time", create_cmd(ExponweibTime))
+        for node_class in TIME_NODES:
+            label = distributions.DISTRIBUTIONS[node_class.DISTRIBUTION].label
+            trans_menu.add_command(label, create_cmd(node_class))
+
+    def _sync_tag(self, node, name, value):
+        # A tag repeated within a trajectory is drawn as several nodes built
+        # from the same symptom_tags entry; an edit to one applies to all.
+        if name != "tag":
+            return
+        paths = set(self.source_paths.get(node.id, []))
+        if not paths:
+            return
+        for other in self.graph.all_nodes():
+            if other is not node and paths & set(self.source_paths.get(other.id, [])):
+                other.set_property("tag", value, push_undo=False)
+
+    def highlight_nodes(self, colors):
+        """
+        Recolours nodes by name, replacing any earlier highlight. Takes a
+        dict of node name -> (r, g, b).
+        """
+        self.clear_highlights()
+
+        for node in self.graph.all_nodes():
+            color = colors.get(node.name())
+            if color:
+                self._base_colors[node.id] = node.color()
+                node.set_color(*color)
+
+        self.graph.viewer().update()
+
+    def invalid_fields(self):
+        """Names the time node fields flagged as out of bounds or not a number."""
+        fields = []
+        for node in self.graph.all_nodes():
+            if not isinstance(node, TimeNode):
+                continue
+            for param in distributions.DISTRIBUTIONS[node.DISTRIBUTION].params:
+                line_edit = node.get_widget(param.name).get_custom_widget()
+                if line_edit.property("invalid"):
+                    fields.append(f"{node.name()}: {param.name}")
+        return fields
+
+    def clear_highlights(self):
+        """Restores the colours nodes had before they were highlighted."""
+        for node in self.graph.all_nodes():
+            color = self._base_colors.get(node.id)
+            if color:
+                node.set_color(*color)
+
+        self._base_colors = {}
+        self.graph.viewer().update()
@@ -0,0 +1,244 @@
+import os
+import sys
+import json
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from PyQt5 import QtWidgets as QtW
+from PyQt5.QtCore import QRectF, QSize, Qt
+from PyQt5.QtGui import QColor, QImage, QPainter
+from PyQt5.QtSvg import QSvgGenerator
+
+import graph
+import configPanel
+import yamlLoader
+import yamlPatcher
+
+FORMATS = ["svg", "png"]
+CACHE_NAME = ".render_cache.json"
+MARGIN = 40
+PNG_SCALE = 2
+
+_worker_app = None
+_worker_panel = None
+_worker_graph = None
+
+
+def find_configs(paths):
+    """Expands directories into the YAML files they contain, without repeats."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.endswith((".yaml", ".yml")):
+                    files.append(os.path.join(path, name))
+        else:
+            files.append(path)
+
+    seen = set()
+    unique = []
+    for file_path in files:
+        real = os.path.realpath(file_path)
+        if real not in seen:
+            seen.add(real)
+            unique.append(file_path)
+    return unique
+
+
+def output_names(configs):
+    """
+    Names the image of each config after its file. Configs sharing a file
+    name, such as runs/a/config.yaml and runs/b/config.yaml, are named after
+    their path below the directory they have in common instead, e.g.
+    a__config and b__config.
+    """
+    stems = [os.path.splitext(os.path.basename(path))[0] for path in configs]
+    counts = {}
+    for stem in stems:
+        counts[stem] = counts.get(stem, 0) + 1
+
+    clashing = [path for path, stem in zip(configs, stems) if counts[stem] > 1]
+    root = (
+        os.path.commonpath([os.path.dirname(os.path.abspath(p)) for p in clashing])
+        if clashing
+        else None
+    )
+
+    names = {}
+    for path, stem in zip(configs, stems):
+        if counts[stem] > 1:
+            relative = os.path.relpath(os.path.abspath(path), root)
+            stem = os.path.splitext(relative)[0].replace(os.sep, "__")
+        names[path] = stem
+    return names
+
+
+def file_hash(file_path):
+    with open(file_path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def export_graphs(paths, output_dir, image_format="svg", jobs=None, force=False):
+    """
+    Renders the trajectory graph of every config into output_dir. Configs
+    whose content hash matches the last render are skipped unless force is
+    set. Returns a dict of config path -> output path, skip note or error.
+    """
+    if image_format not in FORMATS:
+        raise ValueError(f"Unknown image format '{image_format}'.")
+
+    os.makedirs(output_dir, exist_ok=True)
+    cache_path = os.path.join(output_dir, CACHE_NAME)
+    cache = _read_cache(cache_path)
+
+    configs = find_configs(paths)
+    names = output_names(configs)
+    if len(set(names.values())) < len(names):
+        # Only possible with files like a.yaml and a.yml side by side.
+        raise ValueError("Several configs would be rendered to the same file.")
+
+    results = dict.fromkeys(configs)
+    tasks = []
+    hashes = {}
+    for config_path in configs:
+        dest = os.path.join(output_dir, f"{names[config_path]}.{image_format}")
+        digest = file_hash(config_path)
+
+        if not force and cache.get(dest) == digest and os.path.exists(dest):
+            results[config_path] = "unchanged, skipped"
+            continue
+
+        hashes[dest] = digest
+        tasks.append((config_path, dest, image_format))
+
+    if tasks:
+        jobs = min(jobs or os.cpu_count() or 1, len(tasks))
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as pool:
+            for (config_path, dest, _), outcome in zip(tasks, pool.map(_render, tasks)):
+                if outcome:
+                    results[config_path] = outcome
+                    cache.pop(dest, None)
+                else:
+                    results[config_path] = dest
+                    cache[dest] = hashes[dest]
+
+        _write_cache(cache_path, cache)
+
+    return results
+
+
+def render_scene(scene, dest, image_format):
+    """Writes everything in a graph scene to an SVG or PNG file."""
+    source = scene.itemsBoundingRect().adjusted(-MARGIN, -MARGIN, MARGIN, MARGIN)
+    size = source.size().toSize()
+
+    if image_format == "svg":
+        generator = QSvgGenerator()
+        generator.setFileName(dest)
+        generator.setSize(size)
+        generator.setViewBox(QRectF(0, 0, size.width(), size.height()))
+        painter = QPainter(generator)
+        scene.render(painter, QRectF(0, 0, size.width(), size.height()), source)
+        painter.end()
+        return
+
+    image = QImage(size * PNG_SCALE, QImage.Format_ARGB32)
+    image.fill(QColor(38, 50, 56))
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.setRenderHint(QPainter.TextAntialiasing)
+    scene.render(painter, QRectF(image.rect()), source, Qt.KeepAspectRatio)
+    painter.end()
+    if not image.save(dest):
+        raise OSError(f"Could not write {dest}")
+
+
+def _init_worker():
+    # Each worker builds its own offscreen application and widgets once and
+    # reuses them for every config it is handed.
+    global _worker_app, _worker_panel, _worker_graph
+    os.environ["QT_QPA_PLATFORM"] = "offscreen"
+
+    # The loader's progress messages would otherwise land among the
+    # "path: outcome" lines main prints.
+    sys.stdout = sys.stderr
+
+    _worker_app = QtW.QApplication.instance() or QtW.QApplication([])
+    _worker_panel = configPanel.DiseaseConfigWidget()
+    _worker_graph = graph.NodeGraphWidget()
+    _worker_graph.resize(QSize(1280, 720))
+
+
+def _render(task):
+    # Returns None once the image is written, otherwise a "skipped: ..." or
+    # "failed: ..." outcome.
+    config_path, dest, image_format = task
+    try:
+        # Other files in a config folder, such as simulation settings, only
+        # name a disease model, so there is nothing to draw for them.
+        with open(config_path, "r", encoding="utf-8", newline="") as f:
+            source = yamlPatcher.SourceMap(f.read())
+        disease = yamlLoader.disease_section(source)
+        if not disease or not disease.get("trajectories"):
+            return "skipped: no disease trajectories"
+
+        # A config that fails to load must not be rendered with the
+        # previous file's graph.
+        _worker_graph.graph.clear_session()
+        yamlLoader.load_source(source, _worker_panel, _worker_graph)
+
+        if not _worker_graph.graph.all_nodes():
+            return "failed: no trajectory graph could be built"
+
+        render_scene(_worker_graph.graph.viewer().scene(), dest, image_format)
+    except Exception as e:
+        return f"failed: {e}"
+    return None
+
+
+def _read_cache(cache_path):
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_cache(cache_path, cache):
+    with open(cache_path, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="graphExport",
+        description="Render the trajectory graph of each config to an image.",
+    )
+    parser.add_argument("paths", nargs="+", help="config files or directories")
+    parser.add_argument("-o", "--output-dir", default="renders")
+    parser.add_argument("-f", "--format", choices=FORMATS, default="svg")
+    parser.add_argument("-j", "--jobs", type=int, default=None)
+    parser.add_argument(
+        "--force", action="store_true", help="re-render unchanged configs"
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        results = export_graphs(
+            args.paths, args.output_dir, args.format, args.jobs, args.force
+        )
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    failed = False
+    for config_path, outcome in results.items():
+        print(f"{config_path}: {outcome}")
+        failed = failed or outcome.startswith("failed")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,279 @@
+import numpy as np
+from PyQt5 import QtWidgets as QtW
+from PyQt5.QtCore import Qt, QPointF, QRectF
+from PyQt5.QtGui import QColor, QPainter, QPainterPath, QPen, QPolygonF
+
+import distributions
+
+PROFILE_KEYS = ["max_infectiousness", "shape", "rate", "shift"]
+FACTOR_KEYS = ["asymptomatic_infectious_factor", "mild_infectious_factor"]
+
+DRAWS = 500
+POINTS = 200
+HORIZON = 20.0
+# Width in days of a beta profile's support, which configs do not give.
+BETA_DURATION = 14.0
+
+
+def sample_distribution(data, size, rng):
+    """Draws samples from a distribution as written in a config."""
+    dist_type = data.get("type", "constant")
+    dist = distributions.DISTRIBUTIONS.get(dist_type)
+    if dist is None:
+        raise ValueError(f"Unknown distribution type '{dist_type}'.")
+
+    values = dist.defaults()
+    for key, value in data.items():
+        if key != "type":
+            values[dist.resolve(key)] = value
+
+    def param(key):
+        return float(values[key])
+
+    if dist_type == "constant":
+        return np.full(size, param("value"))
+
+    loc, scale = param("loc"), param("scale")
+    if dist_type == "normal":
+        return rng.normal(loc, scale, size)
+    if dist_type == "lognormal":
+        return loc + scale * np.exp(param("s") * rng.standard_normal(size))
+    if dist_type == "gamma":
+        return loc + scale * rng.gamma(param("a"), 1.0, size)
+    if dist_type == "beta":
+        return loc + scale * rng.beta(param("a"), param("b"), size)
+    if dist_type == "exponweib":
+        # Inverse CDF of the exponentiated Weibull distribution.
+        u = rng.random(size)
+        a, c = param("a"), param("c")
+        return loc + scale * (-np.log1p(-(u ** (1.0 / a)))) ** (1.0 / c)
+
+    raise ValueError(f"Cannot sample '{dist_type}' distributions.")
+
+
+def infectiousness_profiles(trans_type, params, times, beta_duration=BETA_DURATION):
+    """
+    Evaluates one infectiousness curve per parameter draw over the time grid,
+    returning an array of shape (draws, len(times)). params holds an array
+    of draws for each of max_infectiousness, shape, rate and shift.
+
+    gamma follows a Gamma(shape, 1 / rate) profile starting at shift, and
+    normal uses the normal curve with the same mean and variance. beta
+    follows a Beta(shape, rate) profile over [shift, shift + beta_duration]:
+    configs give beta no duration, so it is fixed here. Each curve is scaled
+    so that its peak equals max_infectiousness.
+    """
+    shape = params["shape"][:, None]
+    rate = params["rate"][:, None]
+    shift = params["shift"][:, None]
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        log_f = _log_profile(
+            trans_type, shape, rate, times[None, :] - shift, beta_duration
+        )
+
+        # Normalising by the peak avoids evaluating the gamma and beta
+        # functions. The peak is taken at the mode where there is one, so it
+        # is right even when the mode lies off the grid; otherwise (shape < 1,
+        # where the curve is unbounded) the highest point on the grid is used.
+        mode = profile_modes(trans_type, params, beta_duration)[:, None]
+        peak = _log_profile(trans_type, shape, rate, mode, beta_duration)
+        grid_peak = np.max(log_f, axis=1, keepdims=True)
+        peak = np.where(np.isfinite(peak), peak, grid_peak)
+        curves = params["max_infectiousness"][:, None] * np.exp(log_f - peak)
+
+    valid = (shape[:, 0] > 0) & (rate[:, 0] > 0) & np.isfinite(peak[:, 0])
+    return np.where(valid[:, None], curves, np.nan)
+
+
+def profile_modes(trans_type, params, beta_duration=BETA_DURATION):
+    """
+    Returns the time after shift at which each draw's curve peaks, or NaN
+    where the curve has no peak inside its support.
+    """
+    shape, rate = params["shape"], params["rate"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if trans_type == "gamma":
+            return np.where(shape > 1, (shape - 1.0) / rate, np.nan)
+        if trans_type == "normal":
+            return shape / rate
+        if trans_type == "beta":
+            interior = (shape > 1) & (rate > 1)
+            x = (shape - 1.0) / (shape + rate - 2.0)
+            return np.where(interior, beta_duration * x, np.nan)
+    raise ValueError(f"Unknown transmission type '{trans_type}'.")
+
+
+def _log_profile(trans_type, shape, rate, t, beta_duration):
+    # The log of an unnormalised profile at time t after shift.
+    if trans_type == "gamma":
+        return np.where(t > 0, (shape - 1.0) * np.log(t) - rate * t, -np.inf)
+    if trans_type == "normal":
+        mean = shape / rate
+        sd = np.sqrt(shape) / rate
+        return -0.5 * ((t - mean) / sd) ** 2
+    if trans_type == "beta":
+        x = t / beta_duration
+        log_f = (shape - 1.0) * np.log(x) + (rate - 1.0) * np.log1p(-x)
+        return np.where((x > 0) & (x < 1), log_f, -np.inf)
+    raise ValueError(f"Unknown transmission type '{trans_type}'.")
+
+
+def profile_envelope(trans_type, dists, draws=DRAWS, points=POINTS, seed=0):
+    """
+    Samples the transmission parameters and summarises the resulting curves.
+    dists maps each transmission key to its distribution data. Returns the
+    time grid and a dict of curves: the 5th, 25th, 50th, 75th and 95th
+    percentiles of the symptomatic profile and the medians of the
+    asymptomatic and mild profiles. The grid spans at least HORIZON days
+    and is widened to take in the peaks (for beta, the supports) of the
+    draws up to the 95th percentile, the outer band drawn.
+    """
+    # A fixed seed keeps the envelope steady while parameters are edited.
+    rng = np.random.default_rng(seed)
+    params = {key: sample_distribution(dists[key], draws, rng) for key in PROFILE_KEYS}
+
+    start = min(0.0, float(np.median(params["shift"])))
+    ends = params["shift"] + profile_modes(trans_type, params)
+    if trans_type == "beta":
+        ends = np.append(ends, params["shift"] + BETA_DURATION)
+    ends = ends[np.isfinite(ends)]
+    span = HORIZON
+    if ends.size:
+        span = max(HORIZON, 1.1 * (float(np.percentile(ends, 95)) - start))
+    times = np.linspace(start, start + span, points)
+
+    curves = infectiousness_profiles(trans_type, params, times)
+    valid = ~np.isnan(curves[:, 0])
+    if not valid.any():
+        raise ValueError("No parameter draw gives a valid profile.")
+    curves = curves[valid]
+
+    envelope = dict(
+        zip(
+            ["p5", "p25", "p50", "p75", "p95"],
+            np.percentile(curves, [5, 25, 50, 75, 95], axis=0),
+        )
+    )
+    for key, name in zip(FACTOR_KEYS, ["asymptomatic", "mild"]):
+        factor = sample_distribution(dists[key], draws, rng)[valid]
+        envelope[name] = np.median(curves * factor[:, None], axis=0)
+
+    return times, envelope
+
+
+class InfectiousnessPlot(QtW.QWidget):
+    """
+    Draws a sampled infectiousness profile: percentile bands and median for
+    symptomatic cases, with dashed medians for asymptomatic and mild cases.
+    """
+
+    MARGIN_LEFT = 40
+    MARGIN_RIGHT = 10
+    MARGIN_TOP = 10
+    MARGIN_BOTTOM = 25
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMinimumHeight(180)
+        self.times = None
+        self.envelope = None
+        self.message = "No profile yet."
+
+    def set_profile(self, times, envelope):
+        self.times = times
+        self.envelope = envelope
+        self.message = None
+        self.update()
+
+    def set_message(self, message):
+        self.times = None
+        self.envelope = None
+        self.message = message
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.fillRect(self.rect(), QColor("#37474F"))
+
+        font = painter.font()
+        font.setPointSizeF(font.pointSizeF() * 0.8)
+        painter.setFont(font)
+
+        plot = QRectF(
+            self.MARGIN_LEFT,
+            self.MARGIN_TOP,
+            self.width() - self.MARGIN_LEFT - self.MARGIN_RIGHT,
+            self.height() - self.MARGIN_TOP - self.MARGIN_BOTTOM,
+        )
+
+        if self.message or plot.width() <= 0 or plot.height() <= 0:
+            painter.setPen(QColor("#CFD8DC"))
+            painter.drawText(self.rect(), Qt.AlignCenter, self.message or "")
+            return
+
+        t_min, t_max = float(self.times[0]), float(self.times[-1])
+        y_max = float(max(np.max(self.envelope["p95"]), 1e-9)) * 1.05
+
+        xs = plot.left() + (self.times - t_min) / (t_max - t_min) * plot.width()
+
+        def to_points(values):
+            ys = plot.bottom() - values / y_max * plot.height()
+            return [QPointF(x, y) for x, y in zip(xs, ys)]
+
+        painter.setPen(QPen(QColor("#607D8B"), 1))
+        painter.drawRect(plot)
+        painter.setPen(QColor("#CFD8DC"))
+        painter.drawText(
+            QRectF(plot.left(), plot.bottom() + 4, plot.width(), 20),
+            Qt.AlignLeft,
+            f"{t_min:.1f}",
+        )
+        painter.drawText(
+            QRectF(plot.left(), plot.bottom() + 4, plot.width(), 20),
+            Qt.AlignHCenter,
+            "days",
+        )
+        painter.drawText(
+            QRectF(plot.left(), plot.bottom() + 4, plot.width(), 20),
+            Qt.AlignRight,
+            f"{t_max:.1f}",
+        )
+        painter.drawText(
+            QRectF(0, plot.top(), self.MARGIN_LEFT - 4, 20),
+            Qt.AlignRight,
+            f"{y_max:.2g}",
+        )
+
+        painter.setPen(Qt.NoPen)
+        for low, high, alpha in [("p5", "p95", 60), ("p25", "p75", 110)]:
+            band = QPolygonF(
+                to_points(self.envelope[low]) + to_points(self.envelope[high])[::-1]
+            )
+            painter.setBrush(QColor(0, 188, 212, alpha))
+            painter.drawPolygon(band)
+        painter.setBrush(Qt.NoBrush)
+
+        lines = [
+            ("p50", QPen(QColor("#00BCD4"), 2)),
+            ("mild", QPen(QColor("#FFB300"), 1.5, Qt.DashLine)),
+            ("asymptomatic", QPen(QColor("#9CCC65"), 1.5, Qt.DashLine)),
+        ]
+        for key, pen in lines:
+            points = to_points(self.envelope[key])
+            path = QPainterPath(points[0])
+            for point in points[1:]:
+                path.lineTo(point)
+            painter.setPen(pen)
+            painter.drawPath(path)
+
+        legend_x = plot.right() - painter.fontMetrics().width("asymptomatic") - 30
+        for i, (label, (_, pen)) in enumerate(
+            zip(["symptomatic", "mild", "asymptomatic"], lines)
+        ):
+            y = plot.top() + 12 + i * 14
+            painter.setPen(pen)
+            painter.drawLine(QPointF(legend_x, y), QPointF(legend_x + 16, y))
+            painter.setPen(QColor("#CFD8DC"))
+            painter.drawText(QPointF(legend_x + 22, y + 4), label)
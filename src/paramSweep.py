@@ -0,0 +1,302 @@
+import os
+import sys
+import csv
+import random
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+import yaml
+
+import configDiff
+
+GRID = "grid"
+LATIN_HYPERCUBE = "latin_hypercube"
+
+MANIFEST_NAME = "manifest.csv"
+
+_worker_document = None
+_worker_output_dir = None
+
+
+class SweepParameter:
+    """
+    One swept parameter: a label for the manifest, every location in the
+    disease section it is written to, and the values it takes.
+    """
+
+    def __init__(self, label, paths, values=None, low=None, high=None):
+        self.label = label
+        self.paths = paths
+        self.values = values
+        self.low = low
+        self.high = high
+
+
+def load_spec(spec_path):
+    with open(spec_path, "r", encoding="utf-8") as f:
+        spec = yaml.safe_load(f) or {}
+
+    if not spec.get("parameters"):
+        raise ValueError(f"{spec_path} does not list any 'parameters' to sweep.")
+    return spec
+
+
+def resolve_parameters(disease, spec):
+    """
+    Turns the spec's parameter entries into SweepParameters, checking that
+    every target exists in the disease section. Entries either give a dotted
+    'path' relative to the disease section (e.g. 'transmission.shape.loc')
+    or an 'edge' and 'param', which targets that completion_time parameter
+    on every stage whose graph edge has that name.
+    """
+    method = spec.get("method", GRID)
+    if method not in (GRID, LATIN_HYPERCUBE):
+        raise ValueError(f"Unknown sweep method '{method}'.")
+
+    parameters = []
+    for entry in spec["parameters"]:
+        if not isinstance(entry, dict):
+            raise ValueError(f"Sweep entry {entry!r} must be a mapping.")
+
+        if "path" in entry:
+            label = entry["path"]
+            paths = [_parse_path(entry["path"])]
+        elif "edge" in entry and "param" in entry:
+            label = f"{entry['edge']}.{entry['param']}"
+            paths = _edge_paths(disease, entry["edge"], entry["param"])
+            if not paths:
+                raise ValueError(f"No stage matches edge '{entry['edge']}'.")
+        else:
+            raise ValueError(f"Sweep entry {entry} needs a 'path' or 'edge'/'param'.")
+
+        for path in paths:
+            _check_path(disease, path, label)
+
+        values = entry.get("values")
+        low, high = entry.get("low"), entry.get("high")
+        if low is not None:
+            low = _number(low, f"'{label}' low")
+        if high is not None:
+            high = _number(high, f"'{label}' high")
+
+        if method == GRID and values is not None:
+            if not isinstance(values, list) or not values:
+                raise ValueError(f"'{label}' values must be a non-empty list.")
+            values = [_number(v, f"'{label}' values") for v in values]
+        elif method == GRID:
+            if low is None or high is None:
+                raise ValueError(f"'{label}' needs 'values' or 'low'/'high'.")
+            steps = _count(entry.get("steps", 5), f"'{label}' steps")
+            values = _linspace(low, high, steps)
+        elif values is not None:
+            raise ValueError(
+                f"'{label}' gives 'values', which latin_hypercube sampling "
+                "does not use; give 'low' and 'high' instead."
+            )
+        elif low is None or high is None:
+            raise ValueError(f"'{label}' needs 'low' and 'high' for sampling.")
+
+        parameters.append(SweepParameter(label, paths, values, low, high))
+
+    return parameters
+
+
+def generate_samples(spec, parameters):
+    """Returns a list of value tuples, one per variant, ordered like parameters."""
+    if spec.get("method", GRID) == GRID:
+        return list(itertools.product(*(p.values for p in parameters)))
+
+    samples = _count(spec.get("samples", 10), "'samples'")
+    rng = random.Random(spec.get("seed"))
+
+    # Each parameter's range is split into equal strata and every stratum
+    # is used exactly once, in an independent random order per parameter.
+    columns = []
+    for param in parameters:
+        strata = list(range(samples))
+        rng.shuffle(strata)
+        width = (param.high - param.low) / samples
+        columns.append([param.low + (s + rng.random()) * width for s in strata])
+
+    return list(zip(*columns))
+
+
+def run_sweep(config_path, spec_path, output_dir, jobs=None):
+    """
+    Writes one config per sample of the sweep into output_dir, along with a
+    manifest mapping each file to its parameter values. The base config is
+    parsed once here and handed to each worker process when it starts.
+    Returns the path of the manifest.
+    """
+    with open(config_path, "r", encoding="utf-8") as f:
+        document = yaml.safe_load(f) or {}
+
+    stem = os.path.splitext(os.path.basename(config_path))[0]
+    return sweep_document(document, stem, spec_path, output_dir, jobs)
+
+
+def sweep_document(document, stem, spec_path, output_dir, jobs=None):
+    """
+    Runs a sweep over an already loaded config, naming the variants after
+    stem. The variants listed in a manifest already in output_dir, left by
+    an earlier sweep, are deleted first so that none outlive it.
+    """
+    disease = document.get("disease") if isinstance(document, dict) else None
+    if not disease:
+        raise ValueError(f"{stem} does not contain a 'disease' section.")
+
+    spec = load_spec(spec_path)
+    parameters = resolve_parameters(disease, spec)
+    samples = generate_samples(spec, parameters)
+
+    os.makedirs(output_dir, exist_ok=True)
+    _remove_previous_sweep(output_dir)
+
+    width = len(str(max(len(samples) - 1, 0)))
+    paths = [p.paths for p in parameters]
+    tasks = [
+        (f"{stem}_{i:0{width}d}.yaml", paths, values)
+        for i, values in enumerate(samples)
+    ]
+
+    jobs = jobs or os.cpu_count() or 1
+    chunksize = max(1, len(tasks) // (jobs * 4))
+
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_worker,
+        initargs=(document, output_dir),
+    ) as pool:
+        file_names = list(pool.map(_write_variant, tasks, chunksize=chunksize))
+
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    with open(manifest_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["file"] + [p.label for p in parameters])
+        for file_name, values in zip(file_names, samples):
+            writer.writerow([file_name] + list(values))
+
+    return manifest_path
+
+
+def _remove_previous_sweep(output_dir):
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    try:
+        with open(manifest_path, "r", encoding="utf-8", newline="") as f:
+            rows = list(csv.reader(f))[1:]
+    except FileNotFoundError:
+        return
+
+    for row in rows:
+        # Only bare file names are ours; anything else is left alone.
+        if row and row[0] == os.path.basename(row[0]) and row[0].endswith(".yaml"):
+            try:
+                os.remove(os.path.join(output_dir, row[0]))
+            except FileNotFoundError:
+                pass
+    os.remove(manifest_path)
+
+
+def _init_worker(document, output_dir):
+    global _worker_document, _worker_output_dir
+    _worker_document = document
+    _worker_output_dir = output_dir
+
+
+def _write_variant(task):
+    # Every variant overwrites the same set of locations, so the worker's
+    # copy of the document can be edited in place instead of copied.
+    file_name, paths, values = task
+    disease = _worker_document["disease"]
+
+    for targets, value in zip(paths, values):
+        for path in targets:
+            parent = disease
+            for key in path[:-1]:
+                parent = parent[key]
+            parent[path[-1]] = value
+
+    with open(os.path.join(_worker_output_dir, file_name), "w", encoding="utf-8") as f:
+        yaml.safe_dump(_worker_document, f, sort_keys=False)
+
+    return file_name
+
+
+def _number(value, what):
+    # PyYAML reads exponents without a decimal point, such as 1e-3, as
+    # strings, so those are converted here.
+    if isinstance(value, bool):
+        raise ValueError(f"{what} must be a number, not {value!r}.")
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{what} must be a number, not {value!r}.")
+
+
+def _count(value, what):
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        raise ValueError(f"{what} must be a whole number of at least 1.")
+    return value
+
+
+def _parse_path(text):
+    return tuple(int(part) if part.isdigit() else part for part in text.split("."))
+
+
+def _edge_paths(disease, edge, param):
+    paths = []
+    for t_idx, traj in enumerate(disease.get("trajectories", [])):
+        stages = traj.get("stages", [])
+        for i, stage_edge in enumerate(configDiff.stage_edge_names(stages)):
+            if stage_edge == edge:
+                paths.append(
+                    ("trajectories", t_idx, "stages", i, "completion_time", param)
+                )
+    return paths
+
+
+def _check_path(disease, path, label):
+    node = disease
+    try:
+        for key in path[:-1]:
+            node = node[key]
+    except (KeyError, IndexError, TypeError):
+        raise ValueError(f"'{label}' does not exist in the config.")
+
+    if not isinstance(node, dict) or path[-1] not in node:
+        raise ValueError(f"'{label}' does not exist in the config.")
+
+
+def _linspace(low, high, steps):
+    if steps < 2:
+        return [low]
+    step = (high - low) / (steps - 1)
+    return [low + i * step for i in range(steps)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="paramSweep",
+        description="Write a variant of a config for every point of a parameter sweep.",
+    )
+    parser.add_argument("config")
+    parser.add_argument("spec")
+    parser.add_argument("-o", "--output-dir", default="sweep")
+    parser.add_argument("-j", "--jobs", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    try:
+        manifest = run_sweep(args.config, args.spec, args.output_dir, args.jobs)
+    except (OSError, ValueError, yaml.YAMLError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    print(f"Wrote sweep manifest to {manifest}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
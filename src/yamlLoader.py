@@ -1,8 +1,15 @@
-import yaml
 import traceback
 from collections import defaultdict
 from PyQt5 import QtWidgets
 
+import distributions
+import yamlPatcher
+
+TIME_NODE_TYPES = {
+    name: f"transitions.{dist.node_name}"
+    for name, dist in distributions.DISTRIBUTIONS.items()
+}
+
 
 def log(message):
     """Helper to print basic status messages."""
@@ -10,15 +17,28 @@ def log(message):
 
 
 def load_config(file_path, config_panel, graph_widget):
+    """
+    Fills the config panel and graph from a YAML file. Returns the file's
+    SourceMap, which save_config needs to write edits back, or None if the
+    file could not be loaded.
+    """
     log(f"Loading configuration from: {file_path}")
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f)
+        with open(file_path, "r", encoding="utf-8", newline="") as f:
+            source = yamlPatcher.SourceMap(f.read())
     except Exception as e:
         log(f"Error opening YAML file: {e}")
         return
 
-    disease = data.get("disease", {})
+    return load_source(source, config_panel, graph_widget)
+
+
+def load_source(source, config_panel, graph_widget):
+    """
+    Fills the config panel and graph from an already parsed SourceMap.
+    Returns the source, or None if it has no 'disease' section.
+    """
+    disease = disease_section(source)
     if not disease:
         log("Error: YAML file does not contain a 'disease' section.")
         return
@@ -35,19 +55,157 @@ def load_config(file_path, config_panel, graph_widget):
         log(f"Critical error updating graph: {e}")
         traceback.print_exc()
 
+    return source
+
+
+def disease_section(source):
+    """Returns the 'disease' mapping of a loaded file, or None if it has none."""
+    data = source.data
+    disease = data.get("disease") if isinstance(data, dict) else None
+    return disease if isinstance(disease, dict) and disease else None
+
+
+def save_config(file_path, source, config_data, graph_widget):
+    """
+    Writes the config panel and graph edits back into the file they were
+    loaded from. Only values that differ from the loaded ones are rewritten,
+    so comments, ordering and untouched formatting are kept. Returns the
+    number of values rewritten, or None if the file could not be written.
+    """
+    updates = panel_updates(source, config_data)
+    updates.update(_graph_updates(source, graph_widget))
+
+    # Until the file is written, a failure must leave the source matching it.
+    original = source.text
+    try:
+        changed = source.patch(updates)
+    except Exception as e:
+        log(f"Error patching configuration: {e}")
+        source.reload(original)
+        return None
+
+    if not changed:
+        log("No changes to save.")
+        return 0
+
+    try:
+        with open(file_path, "w", encoding="utf-8", newline="") as f:
+            f.write(source.text)
+    except Exception as e:
+        log(f"Error writing YAML file: {e}")
+        source.reload(original)
+        return None
+
+    log(f"Saved {changed} change(s) to: {file_path}")
+    return changed
+
+
+def unsaved_changes(source, config_data, graph_widget):
+    """Returns the number of values save_config would rewrite."""
+    updates = panel_updates(source, config_data)
+    updates.update(_graph_updates(source, graph_widget))
+    return source.pending(updates)
+
+
+def panel_updates(source, config_data):
+    """
+    Keys the config panel's data by the paths it is saved to. A transmission
+    distribution of unchanged type is written back with the keys the file
+    already has, under the file's own names, so saving without edits leaves
+    the file as it was; only a change of type replaces the whole mapping.
+    """
+    updates = {
+        ("disease", "name"): config_data["name"],
+        ("disease", "settings", "default_lowest_stage"): config_data[
+            "default_lowest_stage"
+        ],
+        ("disease", "settings", "max_mild_symptom_tag"): config_data[
+            "max_mild_symptom_tag"
+        ],
+    }
+
+    for key, fields in config_data["transmission"].items():
+        path = ("disease", "transmission", key)
+        original = source.value_at(path) if path in source.spans else None
+        dist = (
+            distributions.DISTRIBUTIONS.get(fields["type"])
+            if isinstance(fields, dict)
+            else None
+        )
+        if (
+            dist is not None
+            and isinstance(original, dict)
+            and original.get("type", "constant") == dist.name
+        ):
+            updates[path] = _write_back(original, dist, lambda p: fields[p.name])
+        else:
+            updates[path] = fields
+
+    return updates
+
+
+def _graph_updates(source, graph_widget):
+    """Reads the loaded nodes back into values keyed by their source path."""
+    updates = {}
+    for node in graph_widget.graph.all_nodes():
+        for path in graph_widget.source_paths.get(node.id, []):
+            if path[-1] == "completion_time":
+                data = _read_time_node(node, source.value_at(path))
+                if data is not None:
+                    updates[path] = data
+            else:
+                updates[path] = _parse_value(node.get_property("tag"))
+    return updates
+
+
+def _read_time_node(node, original):
+    # Time nodes can't change type, so only the parameters the file already
+    # had are read back; anything else on the node is left out of the file.
+    dist_type = original.get("type", "constant")
+    if TIME_NODE_TYPES.get(dist_type) != node.type_:
+        return None
+
+    def read(param):
+        try:
+            return param.parse(node.get_property(param.name))
+        except ValueError:
+            return node.get_property(param.name)
+
+    return _write_back(original, distributions.DISTRIBUTIONS[dist_type], read)
+
+
+def _write_back(original, dist, read):
+    # Replaces each parameter the file gives with read(param), keeping the
+    # key, alias or not, that the file wrote it under.
+    data = dict(original)
+    for k in original:
+        param = dist.param(k)
+        if k != "type" and param is not None:
+            data[k] = read(param)
+    return data
+
+
+def _parse_value(text):
+    for convert in (int, float):
+        try:
+            return convert(text)
+        except (TypeError, ValueError):
+            pass
+    return text
+
 
 def _update_config_panel(panel, disease):
     panel.name_entry.setText(disease.get("name", ""))
 
     settings = disease.get("settings", {})
     if "default_lowest_stage" in settings:
-        panel.dls_combo.setCurrentText(settings["default_lowest_stage"])
+        _set_combo_text(panel.dls_combo, settings["default_lowest_stage"])
     if "max_mild_symptom_tag" in settings:
-        panel.mmst_combo.setCurrentText(settings["max_mild_symptom_tag"])
+        _set_combo_text(panel.mmst_combo, settings["max_mild_symptom_tag"])
 
     trans = disease.get("transmission", {})
     if "type" in trans:
-        panel.trans_type_combo.setCurrentText(trans["type"])
+        _set_combo_text(panel.trans_type_combo, trans["type"])
 
     for key, editor in panel.trans_editors.items():
         if key in trans:
@@ -57,16 +215,28 @@ def _update_config_panel(panel, disease):
             for param, value in dist_data.items():
                 if param == "type":
                     continue
+                if editor.dist:
+                    param = editor.dist.resolve(param)
                 if param in editor.inputs:
                     editor.inputs[param].setText(str(value))
 
 
+def _set_combo_text(combo, text):
+    # Values the combo doesn't list (e.g. a disease-specific stage) are
+    # added, so the panel never shows, or saves, a different value.
+    if combo.findText(str(text)) < 0:
+        combo.addItem(str(text))
+    combo.setCurrentText(str(text))
+
+
 def _update_graph(graph_widget, disease):
     graph = graph_widget.graph
     graph.clear_session()
+    graph_widget.source_paths = {}
 
     symptom_tags = disease.get("symptom_tags", [])
     tag_name_to_value = {t["name"]: t["value"] for t in symptom_tags}
+    tag_name_to_index = {t["name"]: i for i, t in enumerate(symptom_tags)}
     trajectories = disease.get("trajectories", [])
 
     is_source = set()
@@ -104,6 +274,11 @@ def _update_graph(graph_widget, disease):
 
         nodes_cache[tag] = node
 
+        if tag in tag_name_to_index:
+            graph_widget.source_paths[node.id] = [
+                ("disease", "symptom_tags", tag_name_to_index[tag], "value")
+            ]
+
     time_nodes_cache = defaultdict(list)
 
     for t_idx, traj in enumerate(trajectories):
@@ -139,6 +314,11 @@ def _update_graph(graph_widget, disease):
 
                 current_node.set_color(40, 150, 250)
 
+                if tag in tag_name_to_index:
+                    graph_widget.source_paths[current_node.id] = [
+                        ("disease", "symptom_tags", tag_name_to_index[tag], "value")
+                    ]
+
             if not current_node:
                 previous_node = None
                 continue
@@ -149,6 +329,14 @@ def _update_graph(graph_widget, disease):
 
                 prev_stage_data = stages[i - 1]
                 comp_data = prev_stage_data.get("completion_time", {})
+                comp_path = (
+                    "disease",
+                    "trajectories",
+                    t_idx,
+                    "stages",
+                    i - 1,
+                    "completion_time",
+                )
 
                 cache_key = (prev_name, curr_name)
 
@@ -161,10 +349,11 @@ def _update_graph(graph_widget, disease):
                         break
 
                 if existing_time_node:
-                    pass
+                    graph_widget.source_paths[existing_time_node.id].append(comp_path)
                 else:
                     time_node = _create_time_node(graph, comp_data)
                     time_node.set_name(f"{prev_name} -> {curr_name}")
+                    graph_widget.source_paths[time_node.id] = [comp_path]
 
                     time_nodes_cache[cache_key].append((time_node, comp_data))
 
@@ -194,37 +383,20 @@ def _create_time_node(graph, comp_data):
     """Creates a new TimeNode based on distribution type."""
     dist_type = comp_data.get("type", "constant")
 
-    type_map = {
-        "constant": "transitions.ConstantTime",
-        "normal": "transitions.NormalTime",
-        "beta": "transitions.BetaTime",
-        "lognormal": "transitions.LognormalTime",
-        "exponweib": "transitions.ExponweibTime",
-    }
-
-    type_map_entry = type_map.get(dist_type, "transitions.ConstantTime")
+    dist = distributions.DISTRIBUTIONS.get(
+        dist_type, distributions.DISTRIBUTIONS["constant"]
+    )
 
-    node = graph.create_node(type_map_entry, push_undo=False)
+    node = graph.create_node(TIME_NODE_TYPES[dist.name], push_undo=False)
 
     for k, v in comp_data.items():
         if k == "type":
             continue
 
-        prop_name = k
-
-        if type_map_entry.endswith("ConstantTime") and k in ["value", "loc"]:
-            prop_name = "Val"
-
-        if prop_name in node.properties().keys():
-            try:
-                node.set_property(prop_name, str(v), push_undo=False)
-            except Exception:
-                pass
-        else:
-            try:
-                node.set_property(prop_name, str(v), push_undo=False)
-            except Exception:
-                pass
+        try:
+            node.set_property(dist.resolve(k), str(v), push_undo=False)
+        except Exception:
+            pass
 
     return node
 
@@ -0,0 +1,235 @@
+import bisect
+
+import yaml
+
+
+class Span:
+    """Where a value sits in the source text, as [start, end) offsets."""
+
+    __slots__ = ("start", "end", "style", "is_collection")
+
+    def __init__(self, start, end, style=None, is_collection=False):
+        self.start = start
+        self.end = end
+        self.style = style
+        self.is_collection = is_collection
+
+
+class SourceMap:
+    """
+    A parsed YAML document together with the source span of every value in
+    it, keyed by path (a tuple of mapping keys and list indices).
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.data = None
+        self.spans = {}
+        self._parse()
+
+    def _parse(self):
+        loader = yaml.SafeLoader(self.text)
+        try:
+            node = loader.get_single_node()
+            self.data = loader.construct_document(node) if node else None
+        finally:
+            loader.dispose()
+
+        self.spans = {}
+        if node is not None:
+            self._record(node, self.data, ())
+
+    def _record(self, node, value, path):
+        if isinstance(node, yaml.MappingNode):
+            self.spans[path] = Span(
+                node.start_mark.index, _node_end(node), is_collection=True
+            )
+            # Mappings using merge keys or duplicate keys don't line up with
+            # their constructed dict; their children are left unmapped.
+            if isinstance(value, dict) and len(node.value) == len(value):
+                for (_, child), (key, child_value) in zip(node.value, value.items()):
+                    self._record(child, child_value, path + (key,))
+
+        elif isinstance(node, yaml.SequenceNode):
+            self.spans[path] = Span(
+                node.start_mark.index, _node_end(node), is_collection=True
+            )
+            if isinstance(value, list) and len(node.value) == len(value):
+                for i, (child, child_value) in enumerate(zip(node.value, value)):
+                    self._record(child, child_value, path + (i,))
+
+        else:
+            self.spans[path] = Span(
+                node.start_mark.index, node.end_mark.index, style=node.style
+            )
+
+    def reload(self, text):
+        """Replaces the source text, re-reading its values and spans."""
+        self.text = text
+        self._parse()
+
+    def value_at(self, path):
+        value = self.data
+        for key in path:
+            value = value[key]
+        return value
+
+    def _set_value(self, path, new_value):
+        parent = self.value_at(path[:-1])
+        parent[path[-1]] = new_value
+
+    def patch(self, updates):
+        """
+        Rewrites only the spans whose value differs from the one given in
+        updates (a dict of path -> new value) and returns the number of spans
+        rewritten. Paths not present in the source are ignored. Scalars are
+        replaced in place so surrounding comments and layout survive; a
+        mapping whose keys changed is rewritten as an inline flow mapping.
+        """
+        edits = self._plan_edits(updates)
+        if not edits:
+            return 0
+
+        pieces = []
+        cursor = 0
+        for span, _, _, replacement in edits:
+            pieces.append(self.text[cursor : span.start])
+            pieces.append(replacement)
+            cursor = span.end
+        pieces.append(self.text[cursor:])
+        self.text = "".join(pieces)
+
+        if any(span.is_collection for span, _, _, _ in edits):
+            # The new flow mappings have no recorded spans, so re-index.
+            self._parse()
+        else:
+            self._shift_spans(edits)
+
+        return len(edits)
+
+    def pending(self, updates):
+        """Returns the number of spans patch(updates) would rewrite."""
+        return len(self._plan_edits(updates))
+
+    def _plan_edits(self, updates):
+        edits = []
+        for path, new_value in updates.items():
+            if path in self.spans:
+                self._collect_edits(path, new_value, edits)
+
+        # Overlapping updates (a path and one of its parents) keep whichever
+        # edit comes first in the text.
+        edits.sort(key=lambda edit: edit[0].start)
+        kept = []
+        for edit in edits:
+            if not kept or edit[0].start >= kept[-1][0].end:
+                kept.append(edit)
+        return kept
+
+    def _collect_edits(self, path, new_value, edits):
+        span = self.spans[path]
+        old_value = self.value_at(path)
+
+        if values_equal(old_value, new_value):
+            return
+
+        if (
+            isinstance(old_value, dict)
+            and isinstance(new_value, dict)
+            and old_value.keys() == new_value.keys()
+            and all(path + (key,) in self.spans for key in new_value)
+        ):
+            for key, child in new_value.items():
+                self._collect_edits(path + (key,), child, edits)
+            return
+
+        if isinstance(old_value, (dict, list)) or isinstance(new_value, (dict, list)):
+            replacement = dump_inline(new_value)
+        else:
+            replacement = dump_inline(new_value, span.style)
+
+        if span.start == span.end:
+            # An empty value, as in "key:", needs a space after the colon.
+            replacement = " " + replacement
+
+        edits.append((span, path, new_value, replacement))
+
+    def _shift_spans(self, edits):
+        # Every other offset moves by the size change of the edits that end
+        # at or before it, which also stretches the spans that enclose an
+        # edit. The edited spans are set to their new text directly, since
+        # an empty span ends where it starts and would be pushed past it.
+        ends = []
+        deltas = []
+        placed = {}
+        total = 0
+        for span, path, new_value, replacement in edits:
+            start = span.start + total
+            if span.start == span.end:
+                start += 1  # past the space put after the colon
+            placed[id(span)] = (start, span.start + total + len(replacement))
+
+            ends.append(span.end)
+            total += len(replacement) - (span.end - span.start)
+            deltas.append(total)
+            self._set_value(path, new_value)
+
+        def shifted(offset):
+            i = bisect.bisect_right(ends, offset)
+            return offset + (deltas[i - 1] if i else 0)
+
+        for span in self.spans.values():
+            if id(span) in placed:
+                span.start, span.end = placed[id(span)]
+            else:
+                span.start, span.end = shifted(span.start), shifted(span.end)
+
+
+def values_equal(a, b):
+    """
+    Compares loaded and edited values, treating 1 and 1.0 as equal, and an
+    empty value (loaded as None) as equal to the empty text of its field.
+    """
+    if a in (None, "") and b in (None, ""):
+        return True
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(values_equal(a[k], b[k]) for k in a)
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(values_equal(x, y) for x, y in zip(a, b))
+
+    numbers = (int, float)
+    if (
+        isinstance(a, numbers)
+        and isinstance(b, numbers)
+        and not isinstance(a, bool)
+        and not isinstance(b, bool)
+    ):
+        return abs(float(a) - float(b)) <= 1e-12 * max(1.0, abs(float(a)))
+
+    return type(a) == type(b) and a == b
+
+
+def dump_inline(value, style=None):
+    """Serialises a value onto a single line, keeping a string's quote style."""
+    if not isinstance(value, str) or style not in ("'", '"'):
+        style = None
+    text = yaml.safe_dump(
+        value,
+        default_flow_style=True,
+        default_style=style,
+        sort_keys=False,
+        width=float("inf"),
+    )
+    if text.endswith("\n...\n"):
+        text = text[:-5]
+    return text.rstrip("\n")
+
+
+def _node_end(node):
+    # A block collection's end mark sits at the start of whatever follows
+    # it, past any trailing newlines and comments; stop at its last value.
+    if isinstance(node, yaml.MappingNode) and not node.flow_style and node.value:
+        return _node_end(node.value[-1][1])
+    if isinstance(node, yaml.SequenceNode) and not node.flow_style and node.value:
+        return _node_end(node.value[-1])
+    return node.end_mark.index
@@ -0,0 +1,96 @@
+import configDiff
+
+
+def stage(tag, loc=None):
+    stage = {"symptom_tag": tag}
+    if loc is not None:
+        stage["completion_time"] = {"type": "constant", "value": loc}
+    return stage
+
+
+def trajectory(*stages):
+    return {"stages": list(stages)}
+
+
+BASE = {
+    "name": "covid19",
+    "symptom_tags": [
+        {"name": "exposed", "value": 0},
+        {"name": "mild", "value": 1},
+        {"name": "recovered", "value": -3},
+    ],
+    "trajectories": [
+        trajectory(stage("exposed", 2), stage("mild", 5), stage("recovered")),
+        trajectory(stage("exposed", 3), stage("recovered")),
+        trajectory(stage("exposed", 2), stage("mild", 5), stage("recovered")),
+    ],
+}
+
+
+def with_trajectories(*trajectories):
+    return dict(BASE, trajectories=list(trajectories))
+
+
+def test_identical_configs_have_no_differences():
+    assert configDiff.diff_diseases(BASE, dict(BASE)) == []
+
+
+def test_changes_are_keyed_by_name_and_edge():
+    other = dict(BASE, symptom_tags=[dict(t) for t in BASE["symptom_tags"]])
+    other["symptom_tags"][1]["value"] = 4
+    other["trajectories"] = [
+        trajectory(stage("exposed", 2), stage("mild", 6), stage("recovered"))
+    ] + BASE["trajectories"][1:]
+
+    diffs = {d.path: d for d in configDiff.diff_diseases(BASE, other)}
+
+    assert diffs[("symptom_tags", "mild")].kind == configDiff.CHANGED
+    edge = (
+        "trajectories",
+        "exposed => mild => recovered",
+        "edges",
+        "mild -> recovered",
+        "value",
+    )
+    assert (diffs[edge].old, diffs[edge].new) == (5, 6)
+    assert len(diffs) == 2
+
+
+def test_repeated_trajectories_are_numbered_by_occurrence():
+    # Inserting a trajectory ahead of the repeated ones must not renumber them.
+    new = trajectory(stage("exposed", 1), stage("mild"))
+    other = with_trajectories(new, *BASE["trajectories"])
+
+    diffs = configDiff.diff_diseases(BASE, other)
+
+    assert [(d.path, d.kind) for d in diffs] == [
+        (("trajectories", "exposed => mild"), configDiff.ADDED)
+    ]
+    keys = configDiff.canonicalize(BASE)["trajectories"]
+    assert "exposed => mild => recovered (2)" in keys
+
+
+def test_new_trajectory_only_marks_new_edges():
+    new = trajectory(stage("exposed", 2), stage("mild", 7), stage("mild", 1))
+    other = with_trajectories(*BASE["trajectories"], new)
+
+    diffs = configDiff.diff_diseases(BASE, other)
+    nodes = configDiff.affected_nodes(diffs, BASE)
+
+    # "exposed -> mild" already exists in BASE, with the same name.
+    assert nodes == {
+        "mild -> mild 2": configDiff.ADDED,
+        "mild 2": configDiff.ADDED,
+    }
+
+
+def test_changed_and_removed_nodes():
+    other = with_trajectories(
+        trajectory(stage("exposed", 2), stage("mild", 9), stage("recovered")),
+        BASE["trajectories"][2],
+    )
+
+    nodes = configDiff.affected_nodes(configDiff.diff_diseases(BASE, other), BASE)
+
+    # The removed trajectory is not drawn, so it is left out.
+    assert nodes == {"mild -> recovered": configDiff.CHANGED}
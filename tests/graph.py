@@ -0,0 +1,113 @@
+import os
+
+import pytest
+from PyQt5 import QtWidgets
+from PyQt5.QtGui import QValidator
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import distributions
+import graph
+import yamlLoader
+
+ACCEPTABLE = QValidator.Acceptable
+INTERMEDIATE = QValidator.Intermediate
+INVALID = QValidator.Invalid
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+def test_parse_keeps_integers_and_defaults_empty_text():
+    param = distributions.Param("loc", default=1.5)
+
+    assert param.parse("3") == 3 and isinstance(param.parse("3"), int)
+    assert param.parse(" -2.5e1 ") == -25.0
+    assert param.parse("") == 1.5
+    with pytest.raises(ValueError):
+        param.parse("1e")
+
+
+@pytest.mark.parametrize(
+    "text, state",
+    [
+        ("", ACCEPTABLE),
+        ("0.5", ACCEPTABLE),
+        ("1", INTERMEDIATE),
+        ("0", INTERMEDIATE),
+        ("-1", INTERMEDIATE),
+        ("1.5", INTERMEDIATE),
+        ("-", INTERMEDIATE),
+        ("1e", INTERMEDIATE),
+        ("abc", INVALID),
+        ("1..2", INVALID),
+    ],
+)
+def test_compiled_validator_bounds(text, state):
+    validate = distributions.compile_validator(0.0, 1.0, inclusive=False)
+
+    assert validate(text) == state
+
+
+def test_inclusive_validator_accepts_its_bounds():
+    validate = distributions.compile_validator(0.0, 1.0)
+
+    assert validate("0") == validate("1") == ACCEPTABLE
+    assert validate("1.01") == INTERMEDIATE
+
+
+def test_unbounded_validator_accepts_any_number():
+    validate = distributions.compile_validator()
+
+    assert validate("-1e300") == ACCEPTABLE
+    assert validate("+") == INTERMEDIATE
+    assert validate("x") == INVALID
+
+
+def test_field_validator_commits_out_of_range_numbers(app):
+    param = distributions.DISTRIBUTIONS["gamma"].param("scale")
+    validator = distributions.ParamValidator(param)
+
+    assert validator.validate("-1", 0)[0] == ACCEPTABLE
+    assert validator.validate("1e", 0)[0] == INTERMEDIATE
+    assert validator.validate("x", 0)[0] == INVALID
+
+
+def test_aliases_resolve_to_parameters():
+    constant = distributions.DISTRIBUTIONS["constant"]
+
+    assert constant.resolve("loc") == "value"
+    assert constant.param("loc") is constant.param("value")
+    assert constant.param("scale") is None
+
+
+def test_time_nodes_cover_every_distribution():
+    names = {node.__name__: node for node in graph.TIME_NODES}
+
+    assert set(names) == {
+        dist.node_name for dist in distributions.DISTRIBUTIONS.values()
+    }
+    assert names["GammaTime"].DISTRIBUTION == "gamma"
+    assert names["GammaTime"].type_ == "transitions.GammaTime"
+    assert yamlLoader.TIME_NODE_TYPES["gamma"] == "transitions.GammaTime"
+    assert all(issubclass(node, graph.TimeNode) for node in graph.TIME_NODES)
+
+
+def test_gamma_node_flags_out_of_range_edits(app):
+    widget = graph.NodeGraphWidget()
+    node = widget.graph.create_node("transitions.GammaTime", push_undo=False)
+
+    assert [node.get_property(p) for p in ("a", "loc", "scale")] == [
+        "1.0",
+        "0.0",
+        "1.0",
+    ]
+
+    line_edit = node.get_widget("scale").get_custom_widget()
+    line_edit.setText("-1")
+    line_edit.editingFinished.emit()
+
+    assert node.get_property("scale") == "-1"
+    assert widget.invalid_fields() == [f"{node.name()}: scale"]
@@ -0,0 +1,146 @@
+import csv
+
+import pytest
+import yaml
+
+import paramSweep
+
+DISEASE = {
+    "transmission": {
+        "shape": {"type": "normal", "loc": 1.56, "scale": 0.08},
+        "rate": {"type": "normal", "loc": 0.53, "scale": 0.03},
+    },
+    "trajectories": [
+        {
+            "stages": [
+                {
+                    "symptom_tag": "exposed",
+                    "completion_time": {"type": "constant", "value": 2},
+                },
+                {"symptom_tag": "recovered"},
+            ]
+        },
+        {
+            "stages": [
+                {
+                    "symptom_tag": "exposed",
+                    "completion_time": {"type": "constant", "value": 2},
+                },
+                {"symptom_tag": "recovered"},
+            ]
+        },
+    ],
+}
+
+
+def resolve(*entries, **spec):
+    spec["parameters"] = list(entries)
+    return paramSweep.resolve_parameters(DISEASE, spec)
+
+
+def test_grid_is_the_product_of_every_parameter():
+    spec = {"method": "grid"}
+    params = resolve(
+        {"path": "transmission.shape.loc", "values": [1, 2, 3]},
+        {"path": "transmission.rate.loc", "low": 0.5, "high": 1.5, "steps": 4},
+        **spec,
+    )
+
+    samples = paramSweep.generate_samples(spec, params)
+
+    assert len(samples) == 12
+    assert params[1].values == [0.5, 0.5 + 1 / 3, 0.5 + 2 / 3, 1.5]
+    assert len(set(samples)) == 12
+
+
+def test_edge_targets_every_matching_stage():
+    (param,) = resolve(
+        {"edge": "exposed -> recovered", "param": "value", "values": [1]}
+    )
+
+    assert param.label == "exposed -> recovered.value"
+    assert param.paths == [
+        ("trajectories", 0, "stages", 0, "completion_time", "value"),
+        ("trajectories", 1, "stages", 0, "completion_time", "value"),
+    ]
+
+
+def test_latin_hypercube_uses_each_stratum_once():
+    spec = {"method": "latin_hypercube", "samples": 20, "seed": 3}
+    params = resolve(
+        {"path": "transmission.shape.loc", "low": 1, "high": 3},
+        {"path": "transmission.rate.loc", "low": "1e-3", "high": 1e-2},
+        **spec,
+    )
+
+    samples = paramSweep.generate_samples(spec, params)
+
+    assert len(samples) == 20
+    for i, param in enumerate(params):
+        column = [sample[i] for sample in samples]
+        assert all(param.low <= value < param.high for value in column)
+        width = (param.high - param.low) / 20
+        strata = sorted(int((value - param.low) / width) for value in column)
+        assert strata == list(range(20))
+
+    assert paramSweep.generate_samples(spec, params) == samples
+
+
+@pytest.mark.parametrize(
+    "entry, spec, message",
+    [
+        ({"path": "transmission.shape.nope", "values": [1]}, {}, "does not exist"),
+        ({"path": "transmission.shape.loc", "values": [1, "x"]}, {}, "number"),
+        ({"path": "transmission.shape.loc", "low": "a", "high": 2}, {}, "number"),
+        ({"path": "transmission.shape.loc", "low": 1}, {}, "needs"),
+        (
+            {"path": "transmission.shape.loc", "low": 1, "high": 2, "steps": 0},
+            {},
+            "steps",
+        ),
+        ({"path": "transmission.shape.loc", "values": []}, {}, "non-empty"),
+        (
+            {"path": "transmission.shape.loc", "values": [1, 2]},
+            {"method": "latin_hypercube"},
+            "values",
+        ),
+        ({"edge": "mild -> dead", "param": "value", "values": [1]}, {}, "No stage"),
+        (
+            {"path": "transmission.shape.loc", "values": [1]},
+            {"method": "sobol"},
+            "method",
+        ),
+    ],
+)
+def test_invalid_entries_name_the_parameter(entry, spec, message):
+    with pytest.raises(ValueError, match=message):
+        resolve(entry, **spec)
+
+
+def test_samples_must_be_positive():
+    spec = {"method": "latin_hypercube", "samples": 0}
+    params = resolve({"path": "transmission.shape.loc", "low": 1, "high": 2}, **spec)
+
+    with pytest.raises(ValueError, match="samples"):
+        paramSweep.generate_samples(spec, params)
+
+
+def test_rerun_removes_previous_variants(tmp_path):
+    spec_path = tmp_path / "spec.yaml"
+    output_dir = tmp_path / "out"
+    document = {"disease": DISEASE}
+
+    for values in ([1, 2, 3], [4]):
+        spec = {"parameters": [{"path": "transmission.shape.loc", "values": values}]}
+        spec_path.write_text(yaml.safe_dump(spec))
+        manifest = paramSweep.sweep_document(
+            document, "base", str(spec_path), str(output_dir), jobs=1
+        )
+
+    with open(manifest, newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows == [["file", "transmission.shape.loc"], ["base_0.yaml", "4"]]
+    assert sorted(p.name for p in output_dir.iterdir()) == [
+        "base_0.yaml",
+        "manifest.csv",
+    ]
@@ -0,0 +1,136 @@
+import yaml
+
+import yamlLoader
+import yamlPatcher
+
+SOURCE = """\
+disease:
+  name:  # filled in later
+  settings:
+    default_lowest_stage: recovered
+    max_mild_symptom_tag: 'mild'
+  transmission:
+    type: gamma
+    shape:
+      type: constant
+      value: 1.5  # days
+"""
+
+
+def test_unchanged_values_are_not_rewritten():
+    source = yamlPatcher.SourceMap(SOURCE)
+
+    assert source.patch({("disease", "name"): ""}) == 0
+    assert source.patch({("disease", "settings", "max_mild_symptom_tag"): "mild"}) == 0
+    assert source.text == SOURCE
+
+
+def test_empty_value_can_be_patched_repeatedly():
+    source = yamlPatcher.SourceMap(SOURCE)
+
+    for name in ["covid19", "measles", "x"]:
+        assert source.patch({("disease", "name"): name}) == 1
+        assert f"  name: {name}  # filled in later\n" in source.text
+        assert yaml.safe_load(source.text)["disease"]["name"] == name
+
+
+def test_comments_and_quotes_are_kept():
+    source = yamlPatcher.SourceMap(SOURCE)
+    source.patch(
+        {
+            ("disease", "settings", "max_mild_symptom_tag"): "severe",
+            ("disease", "transmission", "shape", "value"): 2.25,
+        }
+    )
+
+    assert "    max_mild_symptom_tag: 'severe'\n" in source.text
+    assert "      value: 2.25  # days\n" in source.text
+    assert source.text.count("#") == SOURCE.count("#")
+
+
+def test_block_mapping_is_rewritten_as_flow():
+    source = yamlPatcher.SourceMap(SOURCE)
+    shape = {"type": "normal", "loc": 1.0, "scale": 0.5}
+
+    assert source.patch({("disease", "transmission", "shape"): shape}) == 1
+    assert (
+        "    shape:\n      {type: normal, loc: 1.0, scale: 0.5}  # days\n"
+        in source.text
+    )
+
+    # The spans are re-indexed, so later patches still land in place.
+    source.patch({("disease", "transmission", "shape", "scale"): 2})
+    assert "{type: normal, loc: 1.0, scale: 2}" in source.text
+    assert source.patch({("disease", "name"): "covid19"}) == 1
+
+    loaded = yaml.safe_load(source.text)["disease"]
+    assert loaded["name"] == "covid19"
+    assert loaded["transmission"]["shape"] == {
+        "type": "normal",
+        "loc": 1.0,
+        "scale": 2,
+    }
+    assert source.data == yaml.safe_load(source.text)
+
+
+def test_values_equal():
+    assert yamlPatcher.values_equal(1, 1.0)
+    assert yamlPatcher.values_equal(None, "")
+    assert not yamlPatcher.values_equal(True, 1)
+    assert not yamlPatcher.values_equal("1", 1)
+
+
+TRANSMISSION = """\
+disease:
+  name: covid19
+  settings:
+    default_lowest_stage: recovered
+    max_mild_symptom_tag: mild
+  transmission:
+    type: gamma
+    shift:
+      type: normal
+      loc: -2.12
+    asymptomatic_infectious_factor:
+      type: constant
+      loc: 0.5  # alias of value
+"""
+
+
+def panel_data(**transmission):
+    # What the config panel gives for TRANSMISSION: every field of each
+    # distribution, with defaults for the ones the file leaves out.
+    data = {
+        "name": "covid19",
+        "default_lowest_stage": "recovered",
+        "max_mild_symptom_tag": "mild",
+        "transmission": {
+            "type": "gamma",
+            "shift": {"type": "normal", "loc": -2.12, "scale": 1.0},
+            "asymptomatic_infectious_factor": {"type": "constant", "value": 0.5},
+        },
+    }
+    data["transmission"].update(transmission)
+    return data
+
+
+def test_panel_save_keeps_file_keys():
+    source = yamlPatcher.SourceMap(TRANSMISSION)
+
+    assert source.patch(yamlLoader.panel_updates(source, panel_data())) == 0
+    assert source.text == TRANSMISSION
+
+    factor = {"type": "constant", "value": 0.25}
+    updates = yamlLoader.panel_updates(
+        source, panel_data(asymptomatic_infectious_factor=factor)
+    )
+    assert source.patch(updates) == 1
+    assert "      loc: 0.25  # alias of value\n" in source.text
+
+
+def test_panel_type_change_replaces_distribution():
+    source = yamlPatcher.SourceMap(TRANSMISSION)
+    shift = {"type": "constant", "value": -2.0}
+
+    assert source.patch(yamlLoader.panel_updates(source, panel_data(shift=shift))) == 1
+    assert yaml.safe_load(source.text)["disease"]["transmission"]["shift"] == shift